@@ -3,15 +3,25 @@ Telegram Bot for Jules API monitoring.
 """
 
 import asyncio
+import contextlib
+import functools
 import logging
 import os
-import re
+import secrets
+import signal
+import statistics
 import sys
-from datetime import datetime, timedelta
-
-from aiogram import Bot, Dispatcher, html, F
+import time
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field
+
+import blake3
+import orjson
+from aiohttp import web
+from aiogram import Bot, Dispatcher, Router, html, F
 from aiogram.filters import Command
 from aiogram.types import Message
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 from dotenv import load_dotenv
 
 from jules_client import JulesClient
@@ -19,12 +29,51 @@ from jules_client import JulesClient
 # Load environment variables
 load_dotenv()
 
+def _env_int(name: str, default: int) -> int:
+    """Reads an integer env variable, using `default` when unset or empty."""
+    value = os.getenv(name, "").strip()
+    return int(value) if value else default
+
 TG_TOKEN = os.getenv("TG_TOKEN")
 JULES_TOKEN = os.getenv("JULES_TOKEN")
 ADMIN_CHAT_ID = os.getenv("ADMIN_CHAT_ID")
 
+# Webhook settings. When WEBHOOK_URL is set, Telegram pushes updates to us
+# instead of the bot polling getUpdates. TLS is terminated at a reverse proxy.
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_PATH = "/tg"
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET") or secrets.token_urlsafe(32)
+WEBAPP_HOST = os.getenv("WEBAPP_HOST", "0.0.0.0")
+WEBAPP_PORT = _env_int("WEBAPP_PORT", 8080)
+
+# getUpdates long-polling wait, seconds. Telegram holds the request open until
+# an update arrives or the timeout expires.
+POLLING_TIMEOUT = 25
+
+# Jules API polling interval bounds, seconds. The monitoring loop starts at the
+# minimum and doubles the interval on every idle cycle up to the maximum.
+MONITOR_INTERVAL_MIN = max(1, _env_int("MONITOR_INTERVAL_MIN", 30))
+MONITOR_INTERVAL_MAX = max(MONITOR_INTERVAL_MIN, _env_int("MONITOR_INTERVAL_MAX", 300))
+# get_session results are shared between callers for this long, seconds
+SESSION_CACHE_TTL = 10
+SESSION_CACHE_SIZE = 128
+
+# Adaptive poll placement: polls spread over the typical time a state lasts
+DWELL_SAMPLES = 50  # Observed durations kept per state
+DWELL_MIN_SAMPLES = 3  # Below this the plain backoff is used
+POLL_BUDGET = 5  # Polls per typical state duration
+# States that never change again, so they give no reason to poll sooner
+TERMINAL_STATES = frozenset(("COMPLETED", "FAILED"))
+
+# How long one /monitor run lasts, seconds
+MONITOR_DURATION = 3600
+# Pause monitoring after this many cycles with only finished sessions (0 disables)
+MONITOR_AUTO_PAUSE_CYCLES = max(0, _env_int("MONITOR_AUTO_PAUSE_CYCLES", 10))
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+# httpx logs every request at INFO; keep the console to bot events
+logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 # Initialize dependencies
@@ -32,14 +81,81 @@ if not TG_TOKEN or not JULES_TOKEN or not ADMIN_CHAT_ID:
     logger.error("Missing environment variables. Please check .env file.")
     sys.exit(1)
 
+try:
+    ADMIN_CHAT_ID = int(ADMIN_CHAT_ID)
+except ValueError:
+    logger.error("ADMIN_CHAT_ID must be a numeric chat id.")
+    sys.exit(1)
+
 bot = Bot(token=TG_TOKEN)
 dp = Dispatcher()
+# Admin commands live on a router that drops messages from other chats
+# before any handler runs; /start stays public on the dispatcher.
+admin_router = Router()
+admin_router.message.filter(F.chat.id == ADMIN_CHAT_ID)
+dp.include_router(admin_router)
 jules_client = JulesClient(api_key=JULES_TOKEN)
 
+@dataclass
+class MonitorState:
+    """Mutable monitoring state shared by the handlers and the background loop."""
+
+    active: bool = False
+    paused: bool = False  # Loop keeps running but skips Jules API calls
+    task: asyncio.Task | None = None
+    sessions: dict[str, str] = field(default_factory=dict)  # session_id -> state string
+    hashes: dict[str, bytes] = field(default_factory=dict)  # session_id -> blake3 digest
+    update_times: dict[str, str] = field(default_factory=dict)  # session_id -> updateTime
+    # (clean session_id, updateTime) -> in-flight or recent get_session result
+    session_cache: OrderedDict = field(default_factory=OrderedDict)
+    # When each session entered its current state (time.monotonic())
+    state_since: dict[str, float] = field(default_factory=dict)
+    # state -> recent observed durations of that state, seconds
+    dwell_times: defaultdict = field(
+        default_factory=lambda: defaultdict(lambda: deque(maxlen=DWELL_SAMPLES))
+    )
+
 # Global state for monitoring
-MONITORING_ACTIVE = False
-MONITORING_TASK_REF = None
-SESSION_STATES = {}  # Key: session_id, Value: state string
+STATE = MonitorState()
+
+# Telegram rejects messages over 4096 characters; leave room for markup
+MESSAGE_CHUNK_LIMIT = 3900
+# Titles are cut before escaping so a long one can't break the HTML markup
+TITLE_LIMIT = 200
+
+# Dynamic command prefixes, followed by a numeric session id
+INFO_PREFIX = "/info_"
+ACTIVITIES_PREFIX = "/list_activities_"
+
+# HTML reply templates; values are escaped before format_map()
+SESSION_CREATED_TMPL = (
+    "✅ Session Created!\n"
+    "🆔 ID: <code>{id}</code>\n"
+    "🔗 URL: {url}\n"
+    "📊 State: {state}"
+)
+SESSION_INFO_TMPL = (
+    "🆔 ID: <code>{id}</code>\n"
+    "📌 Title: {title}\n"
+    "📊 State: {state}\n"
+    "🔗 URL: {url}\n\n"
+    "Activities: /list_activities_{id}"
+)
+ACTIVITY_LINE_TMPL = "• <code>{type}</code> at {time}"
+SESSION_UPDATE_TMPL = "Session: {title} ({sid})\nStatus: {state}"
+
+# States worth a notification even when a session is seen for the first time
+CRITICAL_STATES = frozenset(("AWAITING_PLAN_APPROVAL", "AWAITING_USER_FEEDBACK"))
+
+@functools.lru_cache(maxsize=1024)
+def _q(text: str) -> str:
+    """html.quote, cached for titles and ids repeated across /list and monitoring."""
+    return html.quote(text)
+
+@functools.lru_cache(maxsize=1024)
+def _c(text: str) -> str:
+    """Escaped <code> block, cached like _q."""
+    return html.code(html.quote(text))
 
 @dp.message(Command("start"))
 async def cmd_start(message: Message):
@@ -49,16 +165,14 @@ async def cmd_start(message: Message):
         "Commands:\n"
         "/list - List recent sessions\n"
         "/monitor - Start monitoring sessions for 1 hour\n"
+        "/pause - Pause monitoring without stopping it\n"
+        "/resume - Resume paused monitoring\n"
         "/create <owner/repo> <prompt> - Create a new session"
     )
 
-@dp.message(Command("create"))
+@admin_router.message(Command("create"))
 async def cmd_create(message: Message):
     """Handle /create command."""
-    if str(message.chat.id) != str(ADMIN_CHAT_ID):
-        await message.answer("Unauthorized.")
-        return
-
     # Parse arguments
     # Message text format: /create owner/repo prompt...
     args = message.text.split(maxsplit=2)
@@ -78,9 +192,7 @@ async def cmd_create(message: Message):
 
     await message.answer("Creating session...")
 
-    # Create session (blocking)
-    data = await asyncio.to_thread(
-        jules_client.create_session,
+    data = await jules_client.create_session(
         repo_owner=owner,
         repo_name=repo,
         prompt=prompt
@@ -94,26 +206,20 @@ async def cmd_create(message: Message):
     s_url = data.get("url", f"https://jules.google.com/session/{s_id}")
     s_state = data.get("state", "Unknown State")
 
-    response_msg = (
-        f"✅ Session Created!\n"
-        f"🆔 ID: {html.code(s_id)}\n"
-        f"🔗 URL: {html.quote(s_url)}\n"
-        f"📊 State: {html.quote(s_state)}"
-    )
+    response_msg = SESSION_CREATED_TMPL.format_map({
+        "id": html.quote(s_id),
+        "url": html.quote(s_url),
+        "state": html.quote(s_state),
+    })
 
     await message.answer(response_msg, parse_mode="HTML")
 
-@dp.message(Command("list"))
+@admin_router.message(Command("list"))
 async def cmd_list(message: Message):
     """Handle /list command."""
-    if str(message.chat.id) != str(ADMIN_CHAT_ID):
-        await message.answer("Unauthorized.")
-        return
-
     await message.answer("Fetching sessions...")
 
-    # Run blocking call in a separate thread
-    data = await asyncio.to_thread(jules_client.list_sessions, page_size=10)
+    data = await jules_client.list_sessions(page_size=10)
     sessions = data.get("sessions", [])
 
     if not sessions:
@@ -125,15 +231,62 @@ async def cmd_list(message: Message):
         s_id = session.get("id", "Unknown ID")
         s_title = session.get("title", "No Title")
         # Ensure we display clean ID
-        response_lines.append(f"🆔 {html.code(s_id)}\nTitle: {html.quote(s_title)}\n")
+        response_lines.append(f"🆔 {_c(s_id)}\nTitle: {_q(s_title)}\n")
 
     await message.answer("\n".join(response_lines), parse_mode="HTML")
 
+def _clean_session_id(session_id: str) -> str:
+    """Strips the 'sessions/' resource prefix from a session id."""
+    return session_id.removeprefix("sessions/")
+
+def _numeric_suffix(text: str, prefix: str) -> str | None:
+    """Returns the ASCII-digit tail of `text` after `prefix`, or None."""
+    if not text.startswith(prefix):
+        return None
+    tail = text[len(prefix):]
+    return tail if tail.isascii() and tail.isdigit() else None
+
+async def _get_session_cached(session_id: str) -> dict:
+    """
+    get_session with in-flight coalescing and a short TTL cache.
+    Keyed on the last updateTime seen by monitoring, so a known change
+    bypasses the cache. Empty (failed) results are not kept.
+    """
+    state = STATE
+    update_time = state.update_times.get(session_id) or state.update_times.get(f"sessions/{session_id}")
+    key = (session_id, update_time)
+    cache = state.session_cache
+
+    future = cache.get(key)
+    if future is None:
+        future = asyncio.ensure_future(jules_client.get_session(session_id=session_id))
+        cache[key] = future
+        while len(cache) > SESSION_CACHE_SIZE:
+            cache.popitem(last=False)
+        asyncio.get_running_loop().call_later(SESSION_CACHE_TTL, _evict_session, key, future)
+    else:
+        cache.move_to_end(key)
+
+    try:
+        data = await asyncio.shield(future)
+    except Exception:
+        _evict_session(key, future)
+        raise
+    if not data:
+        _evict_session(key, future)
+    return data
+
+def _evict_session(key: tuple, future: asyncio.Future):
+    """Drops a cached get_session result unless it was already replaced."""
+    cache = STATE.session_cache
+    if cache.get(key) is future:
+        del cache[key]
+
 async def _send_session_info(message: Message, session_id: str):
     """Helper to fetch and send session info."""
     await message.answer(f"Fetching info for session {session_id}...")
 
-    data = await asyncio.to_thread(jules_client.get_session, session_id=session_id)
+    data = await _get_session_cached(session_id)
 
     if not data or "id" not in data:
         await message.answer(f"❌ Session {session_id} not found or error occurred.")
@@ -142,65 +295,49 @@ async def _send_session_info(message: Message, session_id: str):
     s_id = data.get("id", "Unknown ID")
     s_title = data.get("title", "No Title")
     s_state = data.get("state", "Unknown State")
-    clean_id = s_id.replace("sessions/", "")
+    clean_id = _clean_session_id(s_id)
     s_url = data.get("url", f"https://jules.google.com/session/{clean_id}")
 
-
-    response_msg = (
-        f"🆔 ID: {html.code(clean_id)}\n"
-        f"📌 Title: {html.quote(s_title)}\n"
-        f"📊 State: {html.quote(s_state)}\n"
-        f"🔗 URL: {html.quote(s_url)}\n\n"
-        f"Activities: /list_activities_{clean_id}"
-    )
+    response_msg = SESSION_INFO_TMPL.format_map({
+        "id": html.quote(clean_id),
+        "title": html.quote(s_title),
+        "state": html.quote(s_state),
+        "url": html.quote(s_url),
+    })
 
     await message.answer(response_msg, parse_mode="HTML")
 
-@dp.message(Command("info"))
+@admin_router.message(Command("info"))
 async def cmd_info(message: Message):
     """Handle /info <id> command."""
-    if str(message.chat.id) != str(ADMIN_CHAT_ID):
-        await message.answer("Unauthorized.")
-        return
-
     args = message.text.split(maxsplit=1)
     if len(args) < 2:
         await message.answer("Usage: /info <session_id>")
         return
 
-    session_id = args[1].strip()
+    session_id = _clean_session_id(args[1].strip())
     await _send_session_info(message, session_id)
 
 
-@dp.message(F.text.regexp(r"^/info_(\d+)$"))
+@admin_router.message(F.text.startswith(INFO_PREFIX))
 async def cmd_info_regex(message: Message):
     """Handle /info_<id> command."""
-    if str(message.chat.id) != str(ADMIN_CHAT_ID):
-        await message.answer("Unauthorized.")
+    session_id = _numeric_suffix(message.text, INFO_PREFIX)
+    if not session_id:
         return
 
-    match = re.search(r"^/info_(\d+)$", message.text)
-    if not match:
-        return
-
-    session_id = match.group(1)
     await _send_session_info(message, session_id)
 
-@dp.message(F.text.regexp(r"^/list_activities_(\d+)$"))
+@admin_router.message(F.text.startswith(ACTIVITIES_PREFIX))
 async def cmd_activities_dynamic(message: Message):
     """Handle /list_activities_<id> command."""
-    if str(message.chat.id) != str(ADMIN_CHAT_ID):
-        await message.answer("Unauthorized.")
-        return
-
-    match = re.search(r"^/list_activities_(\d+)$", message.text)
-    if not match:
+    session_id = _numeric_suffix(message.text, ACTIVITIES_PREFIX)
+    if not session_id:
         return
 
-    session_id = match.group(1)
     await message.answer(f"Fetching activities for session {session_id}...")
 
-    data = await asyncio.to_thread(jules_client.list_activities, session_id=session_id, page_size=10)
+    data = await jules_client.list_activities(session_id=session_id, page_size=10)
     activities = data.get("activities", [])
 
     if not activities:
@@ -209,9 +346,10 @@ async def cmd_activities_dynamic(message: Message):
 
     response_lines = [html.bold(f"Activities for {session_id}:")]
     for activity in activities:
-        a_type = activity.get("type", "Unknown")
-        a_time = activity.get("createTime", "")
-        response_lines.append(f"• {html.code(a_type)} at {a_time}")
+        response_lines.append(ACTIVITY_LINE_TMPL.format_map({
+            "type": html.quote(activity.get("type", "Unknown")),
+            "time": activity.get("createTime", ""),
+        }))
 
     full_text = "\n".join(response_lines)
     if len(full_text) > 4000:
@@ -219,98 +357,306 @@ async def cmd_activities_dynamic(message: Message):
 
     await message.answer(full_text, parse_mode="HTML")
 
-async def monitoring_loop():
-    """Background task to monitor sessions for changes."""
-    global MONITORING_ACTIVE
-    logger.info("Starting monitoring loop...")
-
-    end_time = datetime.now() + timedelta(hours=1)
+def _truncate(text: str, limit: int) -> str:
+    """Cuts `text` to at most `limit` characters, marking the cut with '...'."""
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+def _chunk_lines(lines: list[str], limit: int = MESSAGE_CHUNK_LIMIT, sep: str = "\n") -> list[str]:
+    """
+    Groups lines into `sep`-joined chunks of at most `limit` characters.
+    Lines longer than `limit` are truncated.
+    """
+    chunks = []
+    current = []
+    size = 0
+    for line in lines:
+        line = _truncate(line, limit)
+        if current and size + len(line) + len(sep) > limit:
+            chunks.append(sep.join(current))
+            current = []
+            size = 0
+        current.append(line)
+        size += len(line) + len(sep)
+    if current:
+        chunks.append(sep.join(current))
+    return chunks
+
+def _sessions_to_notify(previous: dict[str, str], current: dict[str, str]) -> set[str]:
+    """Returns ids from `current` that warrant a notification against `previous`."""
+    # Only (id, state) pairs missing from `previous` can notify: a state
+    # change of a known session, or a critical status on first sight
+    return {
+        s_id for s_id, s_state in current.items() - previous.items()
+        if s_id in previous or s_state in CRITICAL_STATES
+    }
+
+def _record_transitions(state: MonitorState, changed: dict[str, str]):
+    """Records how long sessions stayed in the states they just left."""
+    now = time.monotonic()
+    for s_id, s_state in changed.items():
+        previous = state.sessions.get(s_id)
+        if previous == s_state:
+            continue
+        since = state.state_since.get(s_id)
+        if previous is not None and since is not None:
+            state.dwell_times[previous].append(now - since)
+        state.state_since[s_id] = now
+
+def _next_poll_delay(state: MonitorState, s_state: str) -> float | None:
+    """
+    Returns the poll spacing for sessions in `s_state`: the 90th percentile
+    of its observed durations split across POLL_BUDGET polls, or None while
+    there is not enough history or the state is terminal.
+    """
+    if s_state in TERMINAL_STATES:
+        return None
+    samples = state.dwell_times.get(s_state)
+    if not samples or len(samples) < DWELL_MIN_SAMPLES:
+        return None
+    horizon = statistics.quantiles(samples, n=10)[-1]
+    return min(max(horizon / POLL_BUDGET, MONITOR_INTERVAL_MIN), MONITOR_INTERVAL_MAX)
+
+def _next_interval(idle_cycles: int) -> int:
+    """Returns the polling interval after `idle_cycles` cycles without changes."""
+    return min(MONITOR_INTERVAL_MIN * 2 ** idle_cycles, MONITOR_INTERVAL_MAX)
+
+async def _collect_changes(sessions: list[dict]) -> tuple[dict[str, str], list[str]]:
+    """
+    Diffs `sessions` against the known session states, records the new ones
+    and returns the current id -> state snapshot with the update lines to send.
+    """
+    state = STATE
+    # Skip rows whose updateTime, or failing that content hash, matches the
+    # previous cycle
+    titles = {}
+    current = {}
+    changed = {}
+    for session in sessions:
+        s_id = session.get("id")
+        if not s_id:
+            continue
+        update_time = session.get("updateTime")
+        if update_time and state.update_times.get(s_id) == update_time and s_id in state.sessions:
+            current[s_id] = state.sessions[s_id]
+            continue
+        if update_time:
+            state.update_times[s_id] = update_time
+        digest = blake3.blake3(orjson.dumps(session, option=orjson.OPT_SORT_KEYS)).digest()
+        if state.hashes.get(s_id) == digest and s_id in state.sessions:
+            current[s_id] = state.sessions[s_id]
+            continue
+        state.hashes[s_id] = digest
+        titles[s_id] = _truncate(session.get("title", "No Title"), TITLE_LIMIT)
+        current[s_id] = changed[s_id] = session.get("state", "UNKNOWN")
+
+    # Diff the changed rows against the previous snapshot
+    notify_ids = _sessions_to_notify(state.sessions, changed)
+    _record_transitions(state, changed)
+
+    # Fetch details of the sessions to notify about concurrently
+    detail_ids = [s_id for s_id in changed if s_id in notify_ids]
+    details = await asyncio.gather(
+        *(_get_session_cached(_clean_session_id(s_id)) for s_id in detail_ids),
+        return_exceptions=True
+    )
+    urls = {
+        s_id: detail["url"]
+        for s_id, detail in zip(detail_ids, details)
+        if isinstance(detail, dict) and detail.get("url")
+    }
+
+    # Log changed sessions to console and collect notifications in API order
+    logger.info("Fetched %d sessions, %d changed", len(current), len(changed))
+    changes_detected = []
+    for s_id, s_state in changed.items():
+        logger.info(f"Found session {s_id} ({titles[s_id]}) with status: {s_state}")
+        if s_id in notify_ids:
+            line = SESSION_UPDATE_TMPL.format_map({
+                "title": _q(titles[s_id]), "sid": _c(s_id), "state": html.bold(s_state),
+            })
+            if s_id in urls:
+                line += f"\nURL: {_q(urls[s_id])}"
+            changes_detected.append(line)
+
+    state.sessions.update(changed)
+    return current, changes_detected
+
+# The monitoring loop sleeps through this hook, so tests can replace it
+# without patching asyncio itself
+_sleep = asyncio.sleep
+
+async def _monitor_forever():
+    """Polls sessions until monitoring is stopped; the caller enforces the deadline."""
+    state = STATE
+
+    idle_cycles = 0
+    quiet_cycles = 0  # Cycles in which every session has finished
+    current = {}  # Latest id -> state snapshot
+    last_data = None  # list_sessions returns this same object on 304
+
+    while state.active:
+        if state.paused:
+            # Skip the Jules API entirely; poll at full rate once resumed
+            idle_cycles = quiet_cycles = 0
+            await _sleep(MONITOR_INTERVAL_MIN)
+            continue
 
-    while datetime.now() < end_time and MONITORING_ACTIVE:
         logger.info("Starting monitoring cycle...")
         try:
-            # 1. Fetch recent sessions (blocking)
-            data = await asyncio.to_thread(jules_client.list_sessions, page_size=10)
-            sessions = data.get("sessions", [])
-
-            changes_detected = []
-
-            for session in sessions:
-                s_id = session.get("id")
-                s_title = session.get("title", "No Title")
-                s_state = session.get("state", "UNKNOWN")
-
-                if not s_id:
-                    continue
-
-                # Log found session and its status to console
-                logger.info(f"Found session {s_id} ({s_title}) with status: {s_state}")
-
-                previous_state = SESSION_STATES.get(s_id)
-                should_notify = False
-
-                # Condition 1: Critical status on first sight
-                if previous_state is None:
-                    if s_state in ["AWAITING_PLAN_APPROVAL", "AWAITING_USER_FEEDBACK"]:
-                        should_notify = True
-
-                # Condition 2: State change
-                elif s_state != previous_state:
-                    should_notify = True
-
-                if should_notify:
-                    changes_detected.append(f"Session: {html.quote(s_title)} ({html.code(s_id)})\nStatus: {html.bold(s_state)}")
-
-                # Update state
-                SESSION_STATES[s_id] = s_state
-
-            # 4. Notify if changes
+            # 1. Fetch recent sessions
+            data = await jules_client.list_sessions(page_size=10)
+
+            # 2. Diff against the previous snapshot, unless the API said 304
+            if data is last_data:
+                logger.info("Sessions not modified since the last cycle")
+                changes_detected = []
+            else:
+                last_data = data
+                current, changes_detected = await _collect_changes(data.get("sessions", []))
+
+            # 3. Notify if changes
             if changes_detected:
-                msg = html.bold("Updates:") + "\n" + "\n".join(changes_detected)
-                await bot.send_message(chat_id=ADMIN_CHAT_ID, text=msg, parse_mode="HTML")
+                idle_cycles = 0
+                # One message per tick unless it would exceed Telegram's limit
+                header = html.bold("Updates:")
+                limit = MESSAGE_CHUNK_LIMIT - len(header) - 1
+                for chunk in _chunk_lines(changes_detected, limit, sep="\n\n"):
+                    await bot.send_message(
+                        chat_id=ADMIN_CHAT_ID, text=header + "\n" + chunk, parse_mode="HTML"
+                    )
+            else:
+                idle_cycles += 1
+
+            # 4. Auto-pause once no session can change any more; a running
+            # session may still move into an AWAITING_* state
+            if TERMINAL_STATES.issuperset(current.values()):
+                quiet_cycles += 1
+            else:
+                quiet_cycles = 0
+            if MONITOR_AUTO_PAUSE_CYCLES and quiet_cycles >= MONITOR_AUTO_PAUSE_CYCLES:
+                state.paused = True
+                await bot.send_message(
+                    chat_id=ADMIN_CHAT_ID,
+                    text=f"Monitoring paused: no active sessions for {quiet_cycles} cycles. "
+                         "Use /resume to continue."
+                )
 
         except Exception as e:
             logger.error("Error in monitoring loop: %s", e)
 
-        # Wait for 60 seconds
-        await asyncio.sleep(60)
+        # Back off while nothing changes, but poll sooner when a session's
+        # state usually changes within the backoff interval
+        interval = _next_interval(idle_cycles)
+        for delay in filter(None, (_next_poll_delay(state, s) for s in set(current.values()))):
+            interval = min(interval, delay)
+        logger.info("Next monitoring cycle in %s seconds", interval)
+        await _sleep(interval)
 
-    # Finished. If the loop exited because the time is up (and not because it
-    # was stopped manually), then MONITORING_ACTIVE will still be True.
-    if MONITORING_ACTIVE:
-        MONITORING_ACTIVE = False
+async def monitoring_loop():
+    """Background task to monitor sessions for changes for MONITOR_DURATION."""
+    logger.info("Starting monitoring loop...")
+
+    try:
+        await asyncio.wait_for(_monitor_forever(), timeout=MONITOR_DURATION)
+    except asyncio.TimeoutError:
+        # Time is up. A manual stop returns normally instead, so the
+        # message is only sent when the full hour completed.
+        STATE.active = False
+        STATE.paused = False
         await bot.send_message(
             chat_id=ADMIN_CHAT_ID, text="Monitoring finished (1 hour completed)."
         )
 
-@dp.message(Command("monitor"))
+@admin_router.message(Command("monitor"))
 async def cmd_monitor(message: Message):
     """Handle /monitor command."""
-    global MONITORING_ACTIVE, MONITORING_TASK_REF
-
-    if str(message.chat.id) != str(ADMIN_CHAT_ID):
-        await message.answer("Unauthorized.")
-        return
-
-    if MONITORING_ACTIVE:
+    if STATE.active:
         # Stop monitoring
-        MONITORING_ACTIVE = False
-        if MONITORING_TASK_REF:
-            MONITORING_TASK_REF.cancel()
-            MONITORING_TASK_REF = None
+        STATE.active = False
+        STATE.paused = False
+        if STATE.task:
+            STATE.task.cancel()
+            STATE.task = None
         await message.answer("Monitoring stopped.")
     else:
         # Start monitoring
-        MONITORING_ACTIVE = True
+        STATE.active = True
+        STATE.paused = False
         await message.answer(
-            "Monitoring started. I will check for changes every minute for the next hour."
+            "Monitoring started. I will check for changes for the next hour, "
+            "polling less often while nothing changes."
         )
         # Create background task
-        MONITORING_TASK_REF = asyncio.create_task(monitoring_loop())
+        STATE.task = asyncio.create_task(monitoring_loop())
+
+@admin_router.message(Command("pause"))
+async def cmd_pause(message: Message):
+    """Handle /pause command."""
+    if not STATE.active:
+        await message.answer("Monitoring is not running. Use /monitor to start it.")
+        return
+
+    STATE.paused = True
+    await message.answer("Monitoring paused. Use /resume to continue.")
+
+@admin_router.message(Command("resume"))
+async def cmd_resume(message: Message):
+    """Handle /resume command."""
+    if not STATE.active:
+        await message.answer("Monitoring is not running. Use /monitor to start it.")
+        return
+
+    STATE.paused = False
+    await message.answer("Monitoring resumed.")
+
+async def run_webhook():
+    """Serve Telegram updates via webhook until cancelled or SIGTERM/SIGINT."""
+    app = web.Application()
+    # SimpleRequestHandler rejects requests without a matching
+    # X-Telegram-Bot-Api-Secret-Token header.
+    SimpleRequestHandler(
+        dispatcher=dp, bot=bot, secret_token=WEBHOOK_SECRET
+    ).register(app, path=WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, WEBAPP_HOST, WEBAPP_PORT)
+    await site.start()
+    await bot.set_webhook(
+        url=WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH, secret_token=WEBHOOK_SECRET
+    )
+    logger.info("Webhook server listening on %s:%s", WEBAPP_HOST, WEBAPP_PORT)
+
+    # Stop cleanly on `docker stop`, so the finally blocks still run
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        await stop.wait()
+    finally:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(sig)
+        await bot.delete_webhook()
+        await runner.cleanup()
 
 async def main():
     """Main entry point."""
-    await dp.start_polling(bot)
+    log_worker = asyncio.create_task(jules_client.run_log_worker())
+    try:
+        if WEBHOOK_URL:
+            await run_webhook()
+        else:
+            # getUpdates fails with 409 Conflict while a webhook is set
+            await bot.delete_webhook()
+            await dp.start_polling(bot, polling_timeout=POLLING_TIMEOUT, handle_signals=True)
+    finally:
+        log_worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await log_worker
+        await jules_client.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
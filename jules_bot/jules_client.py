@@ -1,9 +1,11 @@
-import json
+import asyncio
 import logging
+import logging.handlers
 from datetime import datetime
 
 """Jules API Client."""
-import requests
+import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +13,11 @@ class JulesClient:
     """Client for interacting with the Jules API."""
 
     BASE_URL = "https://jules.googleapis.com/v1alpha"
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    MAX_RETRIES = 3
+    BACKOFF_FACTOR = 0.5
+    LOG_BATCH_SIZE = 32
+    LOG_FLUSH_INTERVAL = 1.0
 
     def __init__(self, api_key: str):
         self.api_key = api_key
@@ -19,72 +26,162 @@ class JulesClient:
             "Content-Type": "application/json"
         }
         self.log_file = "jules_api.log"
+        self._log_queue: asyncio.Queue = asyncio.Queue()
+        # Conditional request state for list_sessions, keyed by page size
+        self._etags: dict[int, str] = {}
+        self._last_modified: dict[int, str] = {}
+        self._last_sessions: dict[int, dict] = {}
+
+        # Dedicated logger keeps the file open between writes and rotates it
+        self._api_log = logging.getLogger("jules.api")
+        self._api_log.setLevel(logging.INFO)
+        self._api_log.propagate = False
+        if not self._api_log.handlers:
+            handler = logging.handlers.RotatingFileHandler(
+                self.log_file, maxBytes=5_000_000, backupCount=3, encoding="utf-8", delay=True
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._api_log.addHandler(handler)
+
+        # One shared HTTP/2 connection pool for all calls. The transport retries
+        # failed connects; _get() additionally retries throttled/5xx GETs, so
+        # create_session is never replayed.
+        self._client = httpx.AsyncClient(
+            timeout=10,
+            headers=self.headers,
+            transport=httpx.AsyncHTTPTransport(http2=True, retries=self.MAX_RETRIES),
+        )
+
+    async def aclose(self):
+        """Flushes pending logs and closes the underlying HTTP connection pool."""
+        self.flush_logs()
+        await self._client.aclose()
+
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """GET with backoff retries on throttling and transient server errors."""
+        response = await self._client.get(url, **kwargs)
+        for attempt in range(self.MAX_RETRIES):
+            if response.status_code not in self.RETRY_STATUSES:
+                break
+            await asyncio.sleep(self.BACKOFF_FACTOR * 2 ** attempt)
+            response = await self._client.get(url, **kwargs)
+        return response
 
     def _log_response(self, endpoint: str, response_data: dict):
-        """Logs raw API responses to a file for debugging."""
-        try:
-            timestamp = datetime.now().isoformat()
+        """Queues a raw API response for the debug log file."""
+        self._log_queue.put_nowait((datetime.now().isoformat(), endpoint, response_data))
+
+    def _write_logs(self, batch: list):
+        """Serializes queued responses and writes them as one log record."""
+        lines = []
+        for timestamp, endpoint, response_data in batch:
             log_entry = {
                 "timestamp": timestamp,
                 "endpoint": endpoint,
                 "response": response_data
             }
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
-        except Exception as e:
-            logger.error("Failed to log API response: %s", e)
+            try:
+                lines.append(orjson.dumps(log_entry).decode())
+            except Exception as e:
+                logger.error("Failed to log API response: %s", e)
+        if lines:
+            self._api_log.info("\n".join(lines))
+
+    async def run_log_worker(self):
+        """
+        Background task writing queued API responses to the log file.
+        Batches up to LOG_BATCH_SIZE entries or LOG_FLUSH_INTERVAL seconds
+        and hands each batch to a worker thread.
+        """
+        while True:
+            batch = [await self._log_queue.get()]
+            try:
+                async with asyncio.timeout(self.LOG_FLUSH_INTERVAL):
+                    while len(batch) < self.LOG_BATCH_SIZE:
+                        batch.append(await self._log_queue.get())
+            except TimeoutError:
+                pass
+            finally:
+                # Serialize and write in a worker thread so disk I/O never
+                # blocks the event loop
+                await asyncio.to_thread(self._write_logs, batch)
+
+    def flush_logs(self):
+        """Writes any responses still waiting in the queue."""
+        batch = []
+        while not self._log_queue.empty():
+            batch.append(self._log_queue.get_nowait())
+        if batch:
+            self._write_logs(batch)
 
-    def list_sessions(self, page_size: int = 10) -> dict:
-        """Fetches a list of sessions."""
+    async def list_sessions(self, page_size: int = 10) -> dict:
+        """
+        Fetches a list of sessions.
+        Sends If-None-Match / If-Modified-Since when the previous response had
+        an ETag / Last-Modified; on 304 Not Modified the previously returned
+        dict object itself is returned again.
+        """
         url = f"{self.BASE_URL}/sessions"
         params = {"pageSize": page_size}
+        headers = {}
+        if page_size in self._etags:
+            headers["If-None-Match"] = self._etags[page_size]
+        if page_size in self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified[page_size]
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = await self._get(url, params=params, headers=headers)
+            if response.status_code == 304 and page_size in self._last_sessions:
+                return self._last_sessions[page_size]
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             self._log_response("list_sessions", data)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag:
+                self._etags[page_size] = etag
+            if last_modified:
+                self._last_modified[page_size] = last_modified
+            if etag or last_modified:
+                self._last_sessions[page_size] = data
             return data
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error("Error fetching sessions: %s", e)
             return {}
 
-    def get_session(self, session_id: str) -> dict:
-        """Fetches details for a specific session."""
-        # Strip "sessions/" prefix if present
-        clean_id = session_id.replace("sessions/", "")
-
-        url = f"{self.BASE_URL}/sessions/{clean_id}"
+    async def get_session(self, session_id: str) -> dict:
+        """
+        Fetches details for a specific session.
+        session_id must be the bare ID, without the 'sessions/' prefix.
+        """
+        url = f"{self.BASE_URL}/sessions/{session_id}"
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = await self._get(url)
             response.raise_for_status()
-            data = response.json()
-            self._log_response(f"get_session/{clean_id}", data)
+            data = orjson.loads(response.content)
+            self._log_response(f"get_session/{session_id}", data)
             return data
-        except requests.exceptions.RequestException as e:
-            logger.error("Error fetching session %s: %s", clean_id, e)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error("Error fetching session %s: %s", session_id, e)
             return {}
 
-    def list_activities(self, session_id: str, page_size: int = 30) -> dict:
+    async def list_activities(self, session_id: str, page_size: int = 30) -> dict:
         """
         Fetches activities for a specific session.
-        session_id can be the raw ID or 'sessions/ID'.
+        session_id must be the bare ID, without the 'sessions/' prefix.
         """
-        # Strip "sessions/" prefix if present
-        clean_id = session_id.replace("sessions/", "")
-
-        url = f"{self.BASE_URL}/sessions/{clean_id}/activities"
+        url = f"{self.BASE_URL}/sessions/{session_id}/activities"
         params = {"pageSize": page_size}
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = await self._get(url, params=params)
             response.raise_for_status()
-            data = response.json()
-            self._log_response(f"list_activities/{clean_id}", data)
+            data = orjson.loads(response.content)
+            self._log_response(f"list_activities/{session_id}", data)
             return data
-        except requests.exceptions.RequestException as e:
-            logger.error("Error fetching activities for session %s: %s", clean_id, e)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error("Error fetching activities for session %s: %s", session_id, e)
             return {}
 
-    def create_session(self, repo_owner: str, repo_name: str, prompt: str, branch: str = "main") -> dict:
+    async def create_session(self, repo_owner: str, repo_name: str, prompt: str, branch: str = "main") -> dict:
         """Creates a new session."""
         url = f"{self.BASE_URL}/sessions"
         payload = {
@@ -98,13 +195,13 @@ class JulesClient:
         }
 
         try:
-            response = requests.post(url, headers=self.headers, json=payload, timeout=30)
+            response = await self._client.post(url, json=payload, timeout=30)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             self._log_response("create_session", data)
             return data
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error("Error creating session: %s", e)
-            if e.response is not None:
+            if isinstance(e, httpx.HTTPStatusError):
                 logger.error("API Response: %s", e.response.text)
             return {}
@@ -1,23 +1,34 @@
 
 import asyncio
+import datetime
 import re
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 import os
 
+from aiogram.methods import SendMessage
+from aiogram.types import Chat, Message, Update
+
 # We mock aiogram.Bot so it doesn't validate the token
 with patch('aiogram.client.bot.Bot.__init__', return_value=None):
+    import jules_bot.bot as bot_module
     from jules_bot.bot import _send_session_info, cmd_info_regex, cmd_activities_dynamic, ADMIN_CHAT_ID
 
 class TestInfoLogic(unittest.IsolatedAsyncioTestCase):
 
+    def setUp(self):
+        # Fresh monitoring state, so cached get_session results don't leak
+        patcher = patch('jules_bot.bot.STATE', bot_module.MonitorState())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     async def test_send_session_info_success(self):
         """Test _send_session_info helper with valid data."""
         # Mock message
         mock_message = AsyncMock()
 
         # Mock jules_client in bot module
-        with patch('jules_bot.bot.jules_client') as mock_client:
+        with patch('jules_bot.bot.jules_client', new_callable=AsyncMock) as mock_client:
             mock_client.get_session.return_value = {
                 "id": "sessions/123456",
                 "title": "Test Session",
@@ -46,7 +57,7 @@ class TestInfoLogic(unittest.IsolatedAsyncioTestCase):
         """Test _send_session_info helper when session not found."""
         mock_message = AsyncMock()
 
-        with patch('jules_bot.bot.jules_client') as mock_client:
+        with patch('jules_bot.bot.jules_client', new_callable=AsyncMock) as mock_client:
             mock_client.get_session.return_value = {} # Empty dict for error/not found
 
             await _send_session_info(mock_message, "999")
@@ -56,6 +67,29 @@ class TestInfoLogic(unittest.IsolatedAsyncioTestCase):
             text = args[0]
             self.assertIn("not found", text)
 
+    async def test_send_session_info_coalesces_requests(self):
+        """Concurrent and repeated /info calls share one get_session request."""
+        with patch('jules_bot.bot.jules_client', new_callable=AsyncMock) as mock_client:
+            mock_client.get_session.return_value = {"id": "sessions/123456", "title": "Test Session"}
+
+            await asyncio.gather(
+                _send_session_info(AsyncMock(), "123456"),
+                _send_session_info(AsyncMock(), "123456"),
+            )
+            await _send_session_info(AsyncMock(), "123456")
+
+            mock_client.get_session.assert_called_once_with(session_id="123456")
+
+    async def test_failed_lookup_is_not_cached(self):
+        """An empty result is retried on the next call."""
+        with patch('jules_bot.bot.jules_client', new_callable=AsyncMock) as mock_client:
+            mock_client.get_session.return_value = {}
+
+            await _send_session_info(AsyncMock(), "999")
+            await _send_session_info(AsyncMock(), "999")
+
+            self.assertEqual(mock_client.get_session.call_count, 2)
+
     async def test_cmd_info_regex(self):
         """Test the regex handler logic extraction."""
         mock_message = AsyncMock()
@@ -67,13 +101,24 @@ class TestInfoLogic(unittest.IsolatedAsyncioTestCase):
             await cmd_info_regex(mock_message)
             mock_send.assert_called_with(mock_message, "12345")
 
+    async def test_cmd_info_regex_ignores_non_numeric_id(self):
+        """Non-digit tails after /info_ are not treated as session ids."""
+        mock_message = AsyncMock()
+        mock_message.chat.id = ADMIN_CHAT_ID
+
+        with patch('jules_bot.bot._send_session_info', new_callable=AsyncMock) as mock_send:
+            for text in ("/info_", "/info_12a", "/info_\u00b2"):
+                mock_message.text = text
+                await cmd_info_regex(mock_message)
+            mock_send.assert_not_called()
+
     async def test_cmd_activities_dynamic(self):
         """Test /list_activities_<id> handler."""
         mock_message = AsyncMock()
         mock_message.chat.id = ADMIN_CHAT_ID
         mock_message.text = "/list_activities_555"
 
-        with patch('jules_bot.bot.jules_client') as mock_client:
+        with patch('jules_bot.bot.jules_client', new_callable=AsyncMock) as mock_client:
             mock_client.list_activities.return_value = {
                 "activities": [
                     {"type": "COMMENT", "createTime": "2023-10-10T10:00:00Z"}
@@ -89,5 +134,24 @@ class TestInfoLogic(unittest.IsolatedAsyncioTestCase):
             self.assertIn("COMMENT", text)
             self.assertIn("2023-10-10", text)
 
+    async def test_admin_router_filters_other_chats(self):
+        """Admin handlers only see messages from the admin chat."""
+        mock_bot = AsyncMock()
+        mock_bot.id = 42
+
+        for chat_id, expect_reply in ((ADMIN_CHAT_ID, True), (ADMIN_CHAT_ID + 1, False)):
+            mock_bot.reset_mock()
+            update = Update(update_id=1, message=Message(
+                message_id=1, date=datetime.datetime.now(),
+                chat=Chat(id=chat_id, type="private"), text="/resume",
+            ))
+
+            await bot_module.dp.feed_update(mock_bot, update)
+
+            self.assertEqual(mock_bot.call_count, int(expect_reply))
+            if expect_reply:
+                self.assertIsInstance(mock_bot.call_args.args[0], SendMessage)
+                self.assertEqual(mock_bot.call_args.args[0].chat_id, ADMIN_CHAT_ID)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,70 @@
+
+import unittest
+
+import httpx
+
+from jules_bot.jules_client import JulesClient
+
+class TestListSessionsETag(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.body = b'{"sessions": [{"id": "1", "state": "RUNNING"}]}'
+
+        def handler(request):
+            self.requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=self.body, headers={"ETag": '"v1"'})
+
+        self.client = JulesClient(api_key="fake")
+        await self.client._client.aclose()
+        self.client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await self.client._client.aclose()
+
+    async def test_not_modified_returns_cached_object(self):
+        """A 304 reply returns the previous result object unchanged."""
+        first = await self.client.list_sessions(page_size=10)
+        second = await self.client.list_sessions(page_size=10)
+
+        self.assertEqual(first["sessions"][0]["id"], "1")
+        self.assertIs(second, first)
+        self.assertNotIn("If-None-Match", self.requests[0].headers)
+        self.assertEqual(self.requests[1].headers["If-None-Match"], '"v1"')
+
+    async def test_etag_is_tracked_per_page_size(self):
+        """Different page sizes don't share cached results."""
+        await self.client.list_sessions(page_size=10)
+        await self.client.list_sessions(page_size=5)
+
+        self.assertNotIn("If-None-Match", self.requests[1].headers)
+
+class TestListSessionsLastModified(unittest.IsolatedAsyncioTestCase):
+
+    async def test_if_modified_since_is_sent(self):
+        """Last-Modified from a reply is sent back as If-Modified-Since."""
+        stamp = "Wed, 14 Oct 2026 10:00:00 GMT"
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-Modified-Since") == stamp:
+                return httpx.Response(304)
+            return httpx.Response(200, content=b'{"sessions": []}', headers={"Last-Modified": stamp})
+
+        client = JulesClient(api_key="fake")
+        await client._client.aclose()
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            first = await client.list_sessions(page_size=10)
+            second = await client.list_sessions(page_size=10)
+        finally:
+            await client._client.aclose()
+
+        self.assertIs(second, first)
+        self.assertEqual(requests[1].headers["If-Modified-Since"], stamp)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+# We mock aiogram.Bot so it doesn't validate the token
+with patch('aiogram.client.bot.Bot.__init__', return_value=None):
+    import jules_bot.bot as bot_module
+
+class TestSessionDiff(unittest.TestCase):
+
+    def test_new_critical_session_notifies(self):
+        """A first-seen session in a critical state is reported."""
+        notify = bot_module._sessions_to_notify({}, {"1": "AWAITING_PLAN_APPROVAL"})
+        self.assertEqual(notify, {"1"})
+
+    def test_new_non_critical_session_is_silent(self):
+        """A first-seen session in a regular state is not reported."""
+        notify = bot_module._sessions_to_notify({}, {"1": "RUNNING"})
+        self.assertEqual(notify, set())
+
+    def test_state_change_notifies(self):
+        """Only sessions whose state changed are reported."""
+        previous = {"1": "RUNNING", "2": "AWAITING_PLAN_APPROVAL"}
+        current = {"1": "COMPLETED", "2": "AWAITING_PLAN_APPROVAL"}
+        notify = bot_module._sessions_to_notify(previous, current)
+        self.assertEqual(notify, {"1"})
+
+class TestCollectChanges(unittest.IsolatedAsyncioTestCase):
+
+    async def test_unchanged_rows_are_skipped(self):
+        """Rows with the same content hash are kept in the snapshot but not diffed."""
+        sessions = [{"id": "1", "title": "Task 1", "state": "AWAITING_USER_FEEDBACK"}]
+
+        with patch.object(bot_module, 'jules_client', new_callable=AsyncMock) as mock_client, \
+                patch.object(bot_module, 'STATE', bot_module.MonitorState()):
+            mock_client.get_session.return_value = {}
+            _, first_changes = await bot_module._collect_changes(sessions)
+            current, second_changes = await bot_module._collect_changes([dict(sessions[0])])
+
+        self.assertEqual(len(first_changes), 1)
+        self.assertEqual(second_changes, [])
+        self.assertEqual(current, {"1": "AWAITING_USER_FEEDBACK"})
+        mock_client.get_session.assert_called_once()
+
+    async def test_same_update_time_skips_row(self):
+        """A row whose updateTime did not move is not diffed again."""
+        first = [{"id": "1", "title": "Task 1", "state": "RUNNING", "updateTime": "t1"}]
+        second = [{"id": "1", "title": "Task 1", "state": "COMPLETED", "updateTime": "t1"}]
+
+        with patch.object(bot_module, 'jules_client', new_callable=AsyncMock), \
+                patch.object(bot_module, 'STATE', bot_module.MonitorState()):
+            await bot_module._collect_changes(first)
+            current, changes = await bot_module._collect_changes(second)
+
+        self.assertEqual(changes, [])
+        self.assertEqual(current, {"1": "RUNNING"})
+
+class TestChunkLines(unittest.TestCase):
+
+    def test_chunks_respect_limit(self):
+        """Lines are grouped without any chunk exceeding the limit."""
+        chunks = bot_module._chunk_lines(["x" * 40] * 10, limit=100)
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        self.assertEqual("\n".join(chunks).count("x"), 400)
+        self.assertEqual(len(chunks), 5)
+
+    def test_too_long_line_is_truncated(self):
+        """A single line over the limit is cut rather than sent as is."""
+        chunks = bot_module._chunk_lines(["short", "y" * 500], limit=100)
+        self.assertEqual(chunks[0], "short")
+        self.assertEqual(len(chunks[1]), 100)
+        self.assertTrue(chunks[1].endswith("..."))
+
+    def test_custom_separator(self):
+        """Multi-line updates can be separated by a blank line."""
+        chunks = bot_module._chunk_lines(["a\nb", "c\nd", "e\nf"], limit=10, sep="\n\n")
+        self.assertEqual(chunks, ["a\nb\n\nc\nd", "e\nf"])
+
+class TestPollPlacement(unittest.TestCase):
+
+    def test_transition_records_dwell_time(self):
+        """Leaving a state stores how long the session stayed in it."""
+        state = bot_module.MonitorState(sessions={"1": "RUNNING"})
+        state.state_since["1"] = 100.0
+
+        with patch.object(bot_module.time, 'monotonic', return_value=160.0):
+            bot_module._record_transitions(state, {"1": "AWAITING_PLAN_APPROVAL"})
+
+        self.assertEqual(list(state.dwell_times["RUNNING"]), [60.0])
+        self.assertEqual(state.state_since["1"], 160.0)
+
+    def test_next_poll_delay_uses_dwell_distribution(self):
+        """Delay is the p90 duration split over the poll budget, within bounds."""
+        state = bot_module.MonitorState()
+        state.dwell_times["AWAITING_PLAN_APPROVAL"].extend([200.0] * 10)
+        state.dwell_times["COMPLETED"].extend([200.0] * 10)
+
+        with patch.object(bot_module, 'MONITOR_INTERVAL_MIN', 30), \
+                patch.object(bot_module, 'MONITOR_INTERVAL_MAX', 300), \
+                patch.object(bot_module, 'POLL_BUDGET', 5):
+            self.assertEqual(bot_module._next_poll_delay(state, "AWAITING_PLAN_APPROVAL"), 40.0)
+            self.assertIsNone(bot_module._next_poll_delay(state, "COMPLETED"))
+            self.assertIsNone(bot_module._next_poll_delay(state, "RUNNING"))
+
+class TestMonitoringBackoff(unittest.IsolatedAsyncioTestCase):
+
+    def test_next_interval_doubles_up_to_max(self):
+        """Interval doubles per idle cycle and stops at the maximum."""
+        with patch.object(bot_module, 'MONITOR_INTERVAL_MIN', 30), \
+                patch.object(bot_module, 'MONITOR_INTERVAL_MAX', 300):
+            intervals = [bot_module._next_interval(i) for i in range(6)]
+        self.assertEqual(intervals, [30, 60, 120, 240, 300, 300])
+
+    async def test_monitoring_loop_resets_backoff_on_change(self):
+        """Idle cycles back off; a detected change resets to the minimum."""
+        running = {"sessions": [{"id": "1", "title": "Task 1", "state": "RUNNING"}]}
+        completed = {"sessions": [{"id": "1", "title": "Task 1", "state": "COMPLETED"}]}
+        responses = [running, running, running, completed]
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            if len(sleeps) == len(responses):
+                bot_module.STATE.active = False
+
+        with patch.object(bot_module, 'jules_client', new_callable=AsyncMock) as mock_client, \
+                patch.object(bot_module, 'bot') as mock_bot, \
+                patch.object(bot_module, 'STATE', bot_module.MonitorState(active=True)), \
+                patch.object(bot_module, 'MONITOR_INTERVAL_MIN', 30), \
+                patch.object(bot_module, 'MONITOR_INTERVAL_MAX', 300), \
+                patch.object(bot_module, '_sleep', fake_sleep):
+            mock_client.list_sessions.side_effect = responses
+            mock_bot.send_message = AsyncMock()
+
+            await bot_module.monitoring_loop()
+
+        self.assertEqual(sleeps, [60, 120, 240, 30])
+        mock_bot.send_message.assert_called_once()
+
+    async def test_notification_includes_session_details(self):
+        """Details of changed sessions are fetched and added to the update."""
+        responses = [
+            {"sessions": [{"id": "1", "title": "Task 1", "state": "RUNNING"}]},
+            {"sessions": [{"id": "1", "title": "Task 1", "state": "COMPLETED"}]},
+        ]
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            if len(sleeps) == len(responses):
+                bot_module.STATE.active = False
+
+        with patch.object(bot_module, 'jules_client', new_callable=AsyncMock) as mock_client, \
+                patch.object(bot_module, 'bot') as mock_bot, \
+                patch.object(bot_module, 'STATE', bot_module.MonitorState(active=True)), \
+                patch.object(bot_module, '_sleep', fake_sleep):
+            mock_client.list_sessions.side_effect = responses
+            mock_client.get_session.return_value = {"id": "1", "url": "https://example.com/1"}
+            mock_bot.send_message = AsyncMock()
+
+            await bot_module.monitoring_loop()
+
+        mock_client.get_session.assert_called_once_with(session_id="1")
+        text = mock_bot.send_message.call_args.kwargs["text"]
+        self.assertIn("COMPLETED", text)
+        self.assertIn("https://example.com/1", text)
+
+    async def test_monitoring_stops_at_deadline(self):
+        """The deadline interrupts a pending sleep and reports completion."""
+        async def blocking_sleep(delay):
+            await asyncio.Event().wait()
+
+        with patch.object(bot_module, 'jules_client', new_callable=AsyncMock) as mock_client, \
+                patch.object(bot_module, 'bot') as mock_bot, \
+                patch.object(bot_module, 'STATE', bot_module.MonitorState(active=True)), \
+                patch.object(bot_module, 'MONITOR_DURATION', 0.05), \
+                patch.object(bot_module, '_sleep', blocking_sleep):
+            mock_client.list_sessions.return_value = {"sessions": []}
+            mock_bot.send_message = AsyncMock()
+
+            await bot_module.monitoring_loop()
+
+            self.assertFalse(bot_module.STATE.active)
+
+        self.assertIn("finished", mock_bot.send_message.call_args.kwargs["text"])
+
+    async def test_paused_loop_skips_fetch(self):
+        """A paused loop only sleeps and never calls the Jules API."""
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            if len(sleeps) == 3:
+                bot_module.STATE.active = False
+
+        with patch.object(bot_module, 'jules_client', new_callable=AsyncMock) as mock_client, \
+                patch.object(bot_module, 'STATE', bot_module.MonitorState(active=True, paused=True)), \
+                patch.object(bot_module, 'MONITOR_INTERVAL_MIN', 30), \
+                patch.object(bot_module, '_sleep', fake_sleep):
+            await bot_module.monitoring_loop()
+
+        self.assertEqual(sleeps, [30, 30, 30])
+        mock_client.list_sessions.assert_not_called()
+
+    async def test_auto_pause_after_quiet_cycles(self):
+        """The loop pauses itself when every session has finished for M cycles."""
+        running = {"sessions": [{"id": "1", "title": "Task 1", "state": "COMPLETED"}]}
+
+        async def fake_sleep(delay):
+            if bot_module.STATE.paused:
+                bot_module.STATE.active = False
+
+        with patch.object(bot_module, 'jules_client', new_callable=AsyncMock) as mock_client, \
+                patch.object(bot_module, 'bot') as mock_bot, \
+                patch.object(bot_module, 'STATE', bot_module.MonitorState(active=True)), \
+                patch.object(bot_module, 'MONITOR_AUTO_PAUSE_CYCLES', 2), \
+                patch.object(bot_module, '_sleep', fake_sleep):
+            mock_client.list_sessions.return_value = running
+            mock_bot.send_message = AsyncMock()
+
+            await bot_module.monitoring_loop()
+
+            self.assertTrue(bot_module.STATE.paused)
+
+        self.assertEqual(mock_client.list_sessions.call_count, 2)
+        self.assertIn("paused", mock_bot.send_message.call_args.kwargs["text"])
+
+    async def test_running_session_prevents_auto_pause(self):
+        """A session that is still running keeps the loop polling."""
+        responses = [{"sessions": [{"id": "1", "title": "Task 1", "state": "IN_PROGRESS"}]}] * 5
+        responses.append({"sessions": [{"id": "1", "title": "Task 1", "state": "AWAITING_PLAN_APPROVAL"}]})
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            if len(sleeps) == len(responses):
+                bot_module.STATE.active = False
+
+        with patch.object(bot_module, 'jules_client', new_callable=AsyncMock) as mock_client, \
+                patch.object(bot_module, 'bot') as mock_bot, \
+                patch.object(bot_module, 'STATE', bot_module.MonitorState(active=True)), \
+                patch.object(bot_module, 'MONITOR_AUTO_PAUSE_CYCLES', 2), \
+                patch.object(bot_module, '_sleep', fake_sleep):
+            mock_client.list_sessions.side_effect = responses
+            mock_client.get_session.return_value = {}
+            mock_bot.send_message = AsyncMock()
+
+            await bot_module.monitoring_loop()
+
+            self.assertFalse(bot_module.STATE.paused)
+
+        self.assertEqual(mock_client.list_sessions.call_count, len(responses))
+        self.assertIn("AWAITING_PLAN_APPROVAL", mock_bot.send_message.call_args.kwargs["text"])
+
+if __name__ == "__main__":
+    unittest.main()
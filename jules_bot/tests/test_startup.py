@@ -0,0 +1,62 @@
+
+import asyncio
+import os
+import signal
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# We mock aiogram.Bot so it doesn't validate the token
+with patch('aiogram.client.bot.Bot.__init__', return_value=None):
+    import jules_bot.bot as bot_module
+
+class TestStartup(unittest.IsolatedAsyncioTestCase):
+
+    async def test_webhook_stops_on_sigterm(self):
+        """SIGTERM ends the webhook server and removes the webhook."""
+        runner = MagicMock()
+        runner.setup = AsyncMock()
+        runner.cleanup = AsyncMock()
+        site = MagicMock()
+        site.start = AsyncMock()
+
+        with patch.object(bot_module, 'bot') as mock_bot, \
+                patch.object(bot_module, 'SimpleRequestHandler'), \
+                patch.object(bot_module, 'setup_application'), \
+                patch.object(bot_module.web, 'AppRunner', return_value=runner), \
+                patch.object(bot_module.web, 'TCPSite', return_value=site), \
+                patch.object(bot_module, 'WEBHOOK_URL', "https://example.com"):
+            mock_bot.set_webhook = AsyncMock()
+            mock_bot.delete_webhook = AsyncMock()
+
+            async def send_sigterm():
+                while not mock_bot.set_webhook.called:
+                    await asyncio.sleep(0)
+                os.kill(os.getpid(), signal.SIGTERM)
+
+            await asyncio.wait_for(
+                asyncio.gather(bot_module.run_webhook(), send_sigterm()), timeout=5
+            )
+
+        mock_bot.delete_webhook.assert_awaited_once()
+        runner.cleanup.assert_awaited_once()
+
+    async def test_polling_removes_webhook_first(self):
+        """Polling mode deletes a leftover webhook before calling getUpdates."""
+        calls = []
+
+        with patch.object(bot_module, 'bot') as mock_bot, \
+                patch.object(bot_module, 'dp') as mock_dp, \
+                patch.object(bot_module, 'jules_client') as mock_client, \
+                patch.object(bot_module, 'WEBHOOK_URL', None):
+            mock_bot.delete_webhook = AsyncMock(side_effect=lambda: calls.append("delete_webhook"))
+            mock_dp.start_polling = AsyncMock(side_effect=lambda *a, **kw: calls.append("start_polling"))
+            mock_client.run_log_worker = AsyncMock()
+            mock_client.aclose = AsyncMock()
+
+            await bot_module.main()
+
+        self.assertEqual(calls, ["delete_webhook", "start_polling"])
+        mock_client.aclose.assert_awaited_once()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -25,6 +25,11 @@ with patch.dict(os.environ, {
 # However, given the constraints, I will create a test that implements the *proposed* logic
 # to verify it works as expected before applying it to the main file.
 
+# Mirrors CRITICAL_STATES in jules_bot/bot.py
+CRITICAL_STATES = frozenset(("AWAITING_PLAN_APPROVAL", "AWAITING_USER_FEEDBACK"))
+# Mirrors SESSION_UPDATE_TMPL in jules_bot/bot.py, without the HTML markup
+LINE_TMPL = "Session: {title} ({sid})\nStatus: {state}"
+
 class TestMonitoringLogic(unittest.TestCase):
     def setUp(self):
         self.session_states = {}
@@ -36,37 +41,46 @@ class TestMonitoringLogic(unittest.TestCase):
 
     def run_check(self, sessions):
         # This function mimics the proposed logic for the monitoring loop
-        changes = []
+        # session_states values are (state, update_time) tuples
 
+        # Phase 1: snapshot the sessions whose updateTime moved since last tick
+        new_states = {}
         for session in sessions:
             s_id = session.get("id")
-            s_title = session.get("title", "No Title")
-            s_state = session.get("state", "UNKNOWN")
-
             if not s_id:
                 continue
+            s_title = session.get("title", "No Title")
+            s_state = session.get("state", "UNKNOWN")
+            update_time = session.get("updateTime")
 
             # Log to console requirement
             self.log(f"Checking session {s_id} ({s_title}): {s_state}")
 
-            previous_state = self.session_states.get(s_id)
-
-            should_notify = False
-
-            # Condition 1: Critical status on first sight
-            if previous_state is None:
-                if s_state in ["AWAITING_PLAN_APPROVAL", "AWAITING_USER_FEEDBACK"]:
-                    should_notify = True
-
-            # Condition 2: State change
-            elif s_state != previous_state:
-                should_notify = True
-
-            if should_notify:
-                changes.append(f"Session: {s_title} ({s_id})\nStatus: {s_state}")
+            prev = self.session_states.get(s_id)
+            if prev and update_time is not None and prev[1] == update_time:
+                continue
+            new_states[s_id] = (s_title, s_state, update_time)
+
+        # Phase 2: only (id, state) pairs missing from the previous snapshot can
+        # notify, either as a state change or as a critical status on first sight
+        current = {s_id: s_state for s_id, (_, s_state, _) in new_states.items()}
+        previous = {s_id: prev[0] for s_id, prev in self.session_states.items()}
+        changed_ids = {
+            s_id for s_id, s_state in current.items() - previous.items()
+            if s_id in previous or s_state in CRITICAL_STATES
+        }
+
+        changes = [
+            LINE_TMPL.format_map({"title": s_title, "sid": s_id, "state": s_state})
+            for s_id, (s_title, s_state, _) in new_states.items()
+            if s_id in changed_ids
+        ]
 
-            # Update state
-            self.session_states[s_id] = s_state
+        # Update state in bulk
+        self.session_states.update(
+            (s_id, (s_state, update_time))
+            for s_id, (_, s_state, update_time) in new_states.items()
+        )
 
         return changes
 
@@ -114,5 +128,18 @@ class TestMonitoringLogic(unittest.TestCase):
         self.assertFalse(any("Task 2" in c for c in changes_2), "Should NOT notify about Task 2 (No change)")
         self.assertTrue(any("Task 4" in c for c in changes_2), "Should notify about Task 4 (New Critical)")
 
+    def test_update_time_short_circuit(self):
+        sessions_1 = [{"id": "1", "title": "Task 1", "state": "RUNNING", "updateTime": "t1"}]
+        self.assertEqual(self.run_check(sessions_1), [])
+
+        # updateTime moved: the state change is reported
+        sessions_2 = [{"id": "1", "title": "Task 1", "state": "COMPLETED", "updateTime": "t2"}]
+        self.assertTrue(any("Task 1" in c for c in self.run_check(sessions_2)))
+
+        # Same updateTime: the session is skipped before any state comparison
+        sessions_3 = [{"id": "1", "title": "Task 1", "state": "RUNNING", "updateTime": "t2"}]
+        self.assertEqual(self.run_check(sessions_3), [])
+        self.assertEqual(self.session_states["1"], ("COMPLETED", "t2"))
+
 if __name__ == '__main__':
     unittest.main()